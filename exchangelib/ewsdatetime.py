@@ -1,23 +1,70 @@
 import datetime
+import functools
 import logging
+import re
+import sys
 import warnings
+import weakref
 
 try:
     import zoneinfo
 except ImportError:
     from backports import zoneinfo
-import tzlocal
 
 from .errors import NaiveDateTimeNotAllowed, UnknownTimeZone
 from .winzone import IANA_TO_MS_TIMEZONE_MAP, MS_TIMEZONE_TO_IANA_MAP
 
 log = logging.getLogger(__name__)
 
+# Matches the date and datetime formats that EWS returns, e.g. '2009-01-15', '2009-01-15+01:00',
+# '2009-01-15T13:45:56Z' and '2009-01-15T13:45:56.123+01:00'.
+_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:Z|[+-]\d{2}:\d{2})?')
+_UTC_DATETIME_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?Z')
+_DATETIME_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?([+-]\d{2}:\d{2})?')
+
+
+def _datetime_args(groups):
+    """Convert the date and time groups matched by _UTC_DATETIME_RE or _DATETIME_RE to datetime() arguments."""
+    year, month, day, hour, minute, second, fraction = groups
+    microsecond = int(fraction[:6].ljust(6, '0')) if fraction else 0
+    return int(year), int(month), int(day), int(hour), int(minute), int(second), microsecond
+
+
+# There are only a few thousand valid UTC offsets, so cache the fixed-offset tzinfo objects used while parsing
+_FIXED_OFFSET_CACHE = {}
+
+
+def _get_fixed_offset(minutes):
+    """Return a cached datetime.timezone instance for an offset of 'minutes' from UTC."""
+    try:
+        return _FIXED_OFFSET_CACHE[minutes]
+    except KeyError:
+        tz = _FIXED_OFFSET_CACHE[minutes] = datetime.timezone(datetime.timedelta(minutes=minutes))
+        return tz
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_localize_fold(tz_key, dt, is_dst):
+    """Return the 'fold' value that EWSTimeZone.localize() should use for the naive datetime 'dt' in the given
+    timezone, or None if the wall-clock time is neither ambiguous nor imaginary. Localizing many datetimes that are
+    close in time will often hit the same values, so cache the results.
+    """
+    tz = zoneinfo.ZoneInfo(tz_key)
+    # DST dates are assumed to always be after non-DST dates
+    dst_before = tz.dst(dt.replace(fold=0))
+    dst_after = tz.dst(dt.replace(fold=1))
+    if dst_before > dst_after:
+        return 0 if is_dst else 1
+    if dst_before < dst_after:
+        return 1 if is_dst else 0
+    return None
+
 
 class EWSDate(datetime.date):
     """Extends the normal date implementation to satisfy EWS."""
 
-    __slots__ = '_year', '_month', '_day', '_hashcode'
+    # The date state is stored by the base class. Don't allocate any per-instance storage of our own.
+    __slots__ = ()
 
     def ewsformat(self):
         """ISO 8601 format to satisfy xs:date as interpreted by EWS. Example: 2009-01-15."""
@@ -58,7 +105,11 @@ class EWSDate(datetime.date):
 
     @classmethod
     def from_string(cls, date_string):
-        # Sometimes, we'll receive a date string with timezone information. Not very useful.
+        m = _DATE_RE.fullmatch(date_string)
+        if m:
+            # Sometimes, we'll receive a date string with timezone information. Not very useful, so we ignore it.
+            return cls(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        # Fall back to the more lenient, but slower, strptime()
         if date_string.endswith('Z'):
             date_fmt = '%Y-%m-%dZ'
         elif ':' in date_string:
@@ -77,7 +128,8 @@ class EWSDate(datetime.date):
 class EWSDateTime(datetime.datetime):
     """Extends the normal datetime implementation to satisfy EWS."""
 
-    __slots__ = '_year', '_month', '_day', '_hour', '_minute', '_second', '_microsecond', '_tzinfo', '_hashcode'
+    # The datetime state is stored by the base class. Don't allocate any per-instance storage of our own.
+    __slots__ = ()
 
     def __new__(cls, *args, **kwargs):
         # pylint: disable=arguments-differ
@@ -86,15 +138,15 @@ class EWSDateTime(datetime.datetime):
             tzinfo = args[7]
         else:
             tzinfo = kwargs.get('tzinfo')
-        if isinstance(tzinfo, zoneinfo.ZoneInfo):
-            # Don't allow pytz or dateutil timezones here. They are not safe to use as direct input for datetime()
+        if tzinfo is not None and not isinstance(tzinfo, EWSTimeZone):
+            if not isinstance(tzinfo, zoneinfo.ZoneInfo):
+                # Don't allow pytz or dateutil timezones here. They are not safe to use as direct input for datetime()
+                raise ValueError('tzinfo %r must be an EWSTimeZone instance' % tzinfo)
             tzinfo = EWSTimeZone.from_timezone(tzinfo)
-        if not isinstance(tzinfo, (EWSTimeZone, type(None))):
-            raise ValueError('tzinfo %r must be an EWSTimeZone instance' % tzinfo)
-        if len(args) == 8:
-            args = args[:7] + (tzinfo,)
-        else:
-            kwargs['tzinfo'] = tzinfo
+            if len(args) == 8:
+                args = args[:7] + (tzinfo,)
+            else:
+                kwargs['tzinfo'] = tzinfo
         return super().__new__(cls, *args, **kwargs)
 
     def ewsformat(self):
@@ -105,9 +157,8 @@ class EWSDateTime(datetime.datetime):
         if not self.tzinfo:
             raise ValueError('%r must be timezone-aware' % self)
         if self.tzinfo.key == 'UTC':
-            if self.microsecond:
-                return self.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-            return self.strftime('%Y-%m-%dT%H:%M:%SZ')
+            # isoformat() is much faster than strftime(). Replace the '+00:00' suffix with 'Z'
+            return self.isoformat()[:-6] + 'Z'
         return self.isoformat()
 
     @classmethod
@@ -125,6 +176,9 @@ class EWSDateTime(datetime.datetime):
     def astimezone(self, tz=None):
         if tz is None:
             tz = EWSTimeZone.localzone()
+        if tz is self.tzinfo:
+            # Nothing to convert
+            return self
         t = super().astimezone(tz=tz).replace(tzinfo=tz)
         if isinstance(t, self.__class__):
             return t
@@ -153,6 +207,28 @@ class EWSDateTime(datetime.datetime):
     @classmethod
     def from_string(cls, date_string):
         # Parses several common datetime formats and returns timezone-aware EWSDateTime objects
+        if date_string[-1:] == 'Z':
+            # UTC datetime. This is by far the most common format returned by EWS, so check for it first.
+            m = _UTC_DATETIME_RE.fullmatch(date_string)
+            if m:
+                return cls(*_datetime_args(m.groups()), tzinfo=UTC)
+        else:
+            m = _DATETIME_RE.fullmatch(date_string)
+        if m:
+            args = _datetime_args(m.groups()[:7])
+            tz_string = m.group(8)
+            if tz_string is None:
+                # This is a naive datetime. Don't allow this, but signal caller with an appropriate error
+                raise NaiveDateTimeNotAllowed(cls(*args))
+            # This is a datetime value with timezone information in the form '+/-HH:MM'. Convert to UTC.
+            offset_minutes = int(tz_string[1:3]) * 60 + int(tz_string[4:6])
+            if tz_string[0] == '-':
+                offset_minutes = -offset_minutes
+            aware_dt = datetime.datetime(*args, tzinfo=_get_fixed_offset(offset_minutes)).astimezone(UTC)
+            if isinstance(aware_dt, cls):
+                return aware_dt
+            return cls.from_datetime(aware_dt)
+        # Fall back to the more lenient, but slower, strptime() and fromisoformat()
         if date_string.endswith('Z'):
             # UTC datetime
             return super().strptime(date_string, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=UTC)
@@ -182,6 +258,11 @@ class EWSDateTime(datetime.datetime):
 
     @classmethod
     def now(cls, tz=None):
+        if tz is UTC:
+            # Get the UTC time from the C implementation directly and create the EWSDateTime object once. This skips the
+            # EWSTimeZone.fromutc() call and the intermediate objects it creates.
+            t = datetime.datetime.now(datetime.timezone.utc)
+            return cls(t.year, t.month, t.day, t.hour, t.minute, t.second, t.microsecond, tzinfo=UTC)
         t = super().now(tz=tz)
         if isinstance(t, cls):
             return t
@@ -206,16 +287,37 @@ class EWSTimeZone(zoneinfo.ZoneInfo):
     services.GetServerTimeZones.
     """
 
+    __slots__ = 'ms_id', 'ms_name'
+
     IANA_TO_MS_MAP = IANA_TO_MS_TIMEZONE_MAP
     MS_TO_IANA_MAP = MS_TIMEZONE_TO_IANA_MAP
 
-    def __new__(cls, *args, **kwargs):
+    # Fully initialized instances, keyed by (class, IANA key). ZoneInfo only keeps weak references to instances of
+    # subclasses, so without this cache, the timezone file would be loaded again for every EWSTimeZone(key) call when
+    # no other reference to the timezone exists. See invalidate_cache()
+    _instance_cache = {}
+    # Translations of tzinfo objects from other implementations. See from_timezone()
+    _from_tz_cache = {}
+    # The translation function for each supported tzinfo class. See _from_timezone()
+    _tz_type_handlers = {}
+    # The result of localzone(), keyed by class
+    _localzone_cache = {}
+    # Set by invalidate_localzone(). tzlocal also caches the system timezone, so it must be told to look it up again
+    _reload_localzone = False
+
+    def __new__(cls, key):
         try:
-            instance = super().__new__(cls, *args, **kwargs)
+            return cls._instance_cache[cls, key]
+        except KeyError:
+            pass
+        try:
+            instance = super().__new__(cls, key)
         except zoneinfo.ZoneInfoNotFoundError as e:
             raise UnknownTimeZone(e.args[0])
         try:
-            instance.ms_id = cls.IANA_TO_MS_MAP[instance.key][0]
+            # Intern the ID. It's written to the XML of every request that contains a timezone, and there are only a few
+            # hundred distinct values.
+            instance.ms_id = sys.intern(cls.IANA_TO_MS_MAP[instance.key][0])
         except KeyError:
             raise UnknownTimeZone('No Windows timezone name found for timezone "%s"' % instance.key)
 
@@ -223,8 +325,17 @@ class EWSTimeZone(zoneinfo.ZoneInfo):
         # EWS happily accepts empty strings. For a full list of timezones supported by the target server, including
         # long-format names, see output of services.GetServerTimeZones(account.protocol).call()
         instance.ms_name = ''
+        cls._instance_cache[cls, key] = instance
         return instance
 
+    @classmethod
+    def invalidate_cache(cls):
+        # Makes changes to IANA_TO_MS_MAP take effect. Call this if IANA_TO_MS_MAP is changed after instances have been
+        # created. Keeps the module-level UTC instance, so EWSTimeZone('UTC') always returns the UTC singleton.
+        cls._instance_cache.clear()
+        cls._instance_cache[EWSTimeZone, UTC.key] = UTC
+        cls._from_tz_cache.clear()
+
     def __eq__(self, other):
         # Microsoft timezones are less granular than IANA, so an EWSTimeZone created from 'Europe/Copenhagen' may return
         # from the server as 'Europe/Copenhagen'. We're catering for Microsoft here, so base equality on the Microsoft
@@ -265,29 +376,81 @@ class EWSTimeZone(zoneinfo.ZoneInfo):
 
     @classmethod
     def from_timezone(cls, tz):
-        # Support multiple tzinfo implementations. We could use isinstance(), but then we'd have to have pytz
-        # and dateutil as dependencies for this package.
-        tz_module = tz.__class__.__module__.split('.')[0]
+        if isinstance(tz, EWSTimeZone):
+            # Nothing to translate
+            return tz
+        # Translating a tzinfo object of another implementation is relatively expensive, and applications usually only
+        # use a few distinct tzinfo objects. Cache the result by object identity. The cache holds a weak reference to
+        # the source tzinfo object, to protect against id() values being reused after the object has been garbage
+        # collected.
+        cache_key = cls, id(tz)
+        try:
+            tz_ref, ews_tz = cls._from_tz_cache[cache_key]
+        except KeyError:
+            pass
+        else:
+            if tz_ref() is tz:
+                return ews_tz
+        ews_tz = cls._from_timezone(tz)
+
+        def evict(ref):
+            if cls._from_tz_cache.get(cache_key, (None, None))[0] is ref:
+                del cls._from_tz_cache[cache_key]
+
         try:
-            return {
-                cls.__module__.split('.')[0]: lambda z: z,
-                'backports': cls.from_zoneinfo,
-                'dateutil': cls.from_dateutil,
-                'pytz': cls.from_pytz,
-                'zoneinfo': cls.from_zoneinfo,
-            }[tz_module](tz)
+            cls._from_tz_cache[cache_key] = weakref.ref(tz, evict), ews_tz
+        except TypeError:
+            # Some tzinfo implementations don't support weak references. Don't cache those.
+            pass
+        return ews_tz
+
+    @classmethod
+    def _from_timezone(cls, tz):
+        # The translation method only depends on the tzinfo class, so remember it per class
+        try:
+            handler = cls._tz_type_handlers[cls, type(tz)]
         except KeyError:
-            raise TypeError('Unsupported tzinfo type: %r' % tz)
+            # Support multiple tzinfo implementations. We could use isinstance(), but then we'd have to have pytz
+            # and dateutil as dependencies for this package.
+            tz_module = type(tz).__module__.split('.')[0]
+            try:
+                handler = {
+                    cls.__module__.split('.')[0]: lambda c, z: z,
+                    'backports': cls.from_zoneinfo.__func__,
+                    'dateutil': cls.from_dateutil.__func__,
+                    'pytz': cls.from_pytz.__func__,
+                    'zoneinfo': cls.from_zoneinfo.__func__,
+                }[tz_module]
+            except KeyError:
+                raise TypeError('Unsupported tzinfo type: %r' % tz)
+            cls._tz_type_handlers[cls, type(tz)] = handler
+        return handler(cls, tz)
 
     @classmethod
     def localzone(cls):
+        # Looking up the system timezone is expensive, so only do it once. See invalidate_localzone()
+        try:
+            return cls._localzone_cache[cls]
+        except KeyError:
+            pass
+        # Import lazily. tzlocal is only needed here, and the import takes about 9 ms.
+        import tzlocal
+        get_localzone = tzlocal.reload_localzone if EWSTimeZone._reload_localzone else tzlocal.get_localzone
         try:
-            tz = tzlocal.get_localzone()
+            tz = get_localzone()
         except zoneinfo.ZoneInfoNotFoundError:
             # Older versions of tzlocal will raise a pytz exception. Let's not depend on pytz just for that.
             raise UnknownTimeZone("Failed to guess local timezone")
         # Handle both old and new versions of tzlocal that may return pytz or zoneinfo objects, respectively
-        return cls.from_timezone(tz)
+        EWSTimeZone._reload_localzone = False
+        localzone = cls._localzone_cache[cls] = cls.from_timezone(tz)
+        return localzone
+
+    @classmethod
+    def invalidate_localzone(cls):
+        # Makes the next localzone() call look up the system timezone again. Call this if the system timezone changes
+        cls._localzone_cache.clear()
+        EWSTimeZone._reload_localzone = True
 
     @classmethod
     def timezone(cls, location):
@@ -302,18 +465,10 @@ class EWSTimeZone(zoneinfo.ZoneInfo):
         warnings.warn('replace tz.localize() with dt.replace(tzinfo=tz)', DeprecationWarning, stacklevel=2)
         if dt.tzinfo is not None:
             raise ValueError('%r must be timezone-unaware' % dt)
-        dt = dt.replace(tzinfo=self)
-        if is_dst is not None:
-            # DST dates are assumed to always be after non-DST dates
-            dt_before = dt.replace(fold=0)
-            dt_after = dt.replace(fold=1)
-            dst_before = dt_before.dst()
-            dst_after = dt_after.dst()
-            if dst_before > dst_after:
-                dt = dt_before if is_dst else dt_after
-            elif dst_before < dst_after:
-                dt = dt_after if is_dst else dt_before
-        return dt
+        fold = None if is_dst is None else _get_localize_fold(self.key, dt, is_dst)
+        if fold is None:
+            return dt.replace(tzinfo=self)
+        return dt.replace(tzinfo=self, fold=fold)
 
     def fromutc(self, dt):
         t = super().fromutc(dt)
@@ -322,5 +477,6 @@ class EWSTimeZone(zoneinfo.ZoneInfo):
         return EWSDateTime.from_datetime(t)  # We want to return EWSDateTime objects
 
 
+# A singleton. EWSTimeZone('UTC') returns this instance, which lets datetime skip conversions between UTC values.
 UTC = EWSTimeZone('UTC')
 UTC_NOW = lambda: EWSDateTime.now(tz=UTC)  # noqa: E731
@@ -4,7 +4,6 @@ from .base import BaseReplyItem, AUTO_RESOLVE, SEND_TO_NONE, SEND_ONLY, SEND_AND
 from .item import Item
 from ..fields import BooleanField, Base64Field, TextField, MailboxField, MailboxListField, CharField, EWSElementField
 from ..properties import ReferenceItemId, ReminderMessageData
-from ..services import SendItem, MarkAsJunk
 from ..util import require_account, require_id
 from ..version import EXCHANGE_2013, EXCHANGE_2013_SP1
 
@@ -53,10 +52,7 @@ class Message(Item):
         if save_copy and not copy_to_folder:
             copy_to_folder = self.account.sent  # 'Sent' is default EWS behaviour
         if self.id:
-            SendItem(account=self.account).get(items=[self], saved_item_folder=copy_to_folder)
-            # The item will be deleted from the original folder
-            self._id = None
-            self.folder = copy_to_folder
+            self.bulk_send([self], save_copy=save_copy, copy_to_folder=copy_to_folder)
             return None
 
         # New message
@@ -76,6 +72,89 @@ class Message(Item):
         self._create(message_disposition=SEND_ONLY, send_meeting_invitations=send_meeting_invitations)
         return None
 
+    @classmethod
+    def bulk_send(cls, messages, save_copy=True, copy_to_folder=None, chunk_size=None):
+        """Send existing draft messages. Messages are grouped by account, and each group is sent using
+        Account.bulk_send() instead of one request per message.
+
+        Messages that were sent successfully are updated even if other messages failed. The first error is raised when
+        all messages have been processed.
+
+        :param messages: an iterable of Message objects that already have an ID
+        :param save_copy: If true, saves a copy of the messages (Default value = True)
+        :param copy_to_folder: If requested, save a copy of the messages in this folder. Default is the Sent folder
+        :param chunk_size: The number of items to send to the server in a single request (Default value = None)
+        :return:
+        """
+        if copy_to_folder and not save_copy:
+            raise AttributeError("'save_copy' must be True when 'copy_to_folder' is set")
+        errors = []
+        for account, group in cls._group_by_account(messages).items():
+            saved_item_folder = copy_to_folder
+            if save_copy and not saved_item_folder:
+                saved_item_folder = account.sent  # 'Sent' is default EWS behaviour
+            res = account.bulk_send(
+                ids=group, save_copy=save_copy, copy_to_folder=saved_item_folder, chunk_size=chunk_size
+            )
+            for message, r in zip(group, res):
+                if isinstance(r, Exception):
+                    errors.append(r)
+                    continue
+                # The item will be deleted from the original folder
+                message._id = None
+                message.folder = saved_item_folder
+        if errors:
+            raise errors[0]
+
+    @classmethod
+    def bulk_mark_as_junk(cls, messages, is_junk=True, move_item=True, chunk_size=None):
+        """Mark or un-marks messages as junk email. Messages are grouped by account, and each group is marked using
+        Account.bulk_mark_as_junk() instead of one request per message.
+
+        Messages that were marked successfully are updated even if other messages failed. The first error is raised
+        when all messages have been processed.
+
+        :param messages: an iterable of Message objects that already have an ID
+        :param is_junk: If True, the senders will be added from the blocked sender list. Otherwise, the senders will be
+        removed.
+        :param move_item: If true, the items will be moved to the junk folder.
+        :param chunk_size: The number of items to send to the server in a single request (Default value = None)
+        :return:
+        """
+        errors = []
+        for account, group in cls._group_by_account(messages).items():
+            res = account.bulk_mark_as_junk(ids=group, is_junk=is_junk, move_item=move_item, chunk_size=chunk_size)
+            if not move_item:
+                # The server only returns new IDs for moved items, so the result contains nothing but the errors
+                for r in res:
+                    if not isinstance(r, Exception):
+                        raise ValueError('Expected result length 0, but got %r' % res)
+                    errors.append(r)
+                continue
+            if len(res) != len(group):
+                raise ValueError('Expected result length %s, but got %r' % (len(group), res))
+            folder = account.junk if is_junk else account.inbox
+            for message, r in zip(group, res):
+                if isinstance(r, Exception):
+                    errors.append(r)
+                    continue
+                message.folder = folder
+                message.id, message.changekey = r
+        if errors:
+            raise errors[0]
+
+    @staticmethod
+    def _group_by_account(messages):
+        # Returns a dict of account -> list of messages, preserving the input order within each account
+        groups = {}
+        for message in messages:
+            if not message.account:
+                raise ValueError('%s must have an account' % message.__class__.__name__)
+            if not message.id:
+                raise ValueError('%s must have an ID' % message.__class__.__name__)
+            groups.setdefault(message.account, []).append(message)
+        return groups
+
     def send_and_save(self, update_fields=None, conflict_resolution=AUTO_RESOLVE,
                       send_meeting_invitations=SEND_TO_NONE):
         # Sends Message and saves a copy in the parent folder. Does not return an ItemId.
@@ -129,9 +208,7 @@ class Message(Item):
 
     @require_id
     def create_reply_all(self, subject, body):
-        to_recipients = list(self.to_recipients) if self.to_recipients else []
-        if self.author:
-            to_recipients.append(self.author)
+        to_recipients = [*(self.to_recipients or ()), self.author] if self.author else list(self.to_recipients or ())
         return ReplyAllToItem(
             account=self.account,
             reference_item_id=ReferenceItemId(id=self.id, changekey=self.changekey),
@@ -153,13 +230,7 @@ class Message(Item):
         :param move_item: If true, the item will be moved to the junk folder.
         :return:
         """
-        res = MarkAsJunk(account=self.account).get(
-            items=[self], is_junk=is_junk, move_item=move_item, expect_result=move_item
-        )
-        if res is None:
-            return
-        self.folder = self.account.junk if is_junk else self.account.inbox
-        self.id, self.changekey = res
+        self.bulk_mark_as_junk([self], is_junk=is_junk, move_item=move_item)
 
 
 class ReplyToItem(BaseReplyItem):
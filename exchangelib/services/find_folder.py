@@ -16,6 +16,7 @@ class FindFolder(EWSAccountService):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.root = None  # A hack to communicate parsing args to _elems_to_objs()
+        self._payload_cache = None  # The payload of the previous page, reused when only the offset changes
 
     def call(self, folders, additional_fields, restriction, shape, depth, max_items, offset):
         """Find subfolders of a folder.
@@ -57,28 +58,46 @@ class FindFolder(EWSAccountService):
                 continue
             yield Folder.from_xml_with_root(elem=elem, root=self.root)
 
+    @classmethod
+    def _get_elements_in_container(cls, container):
+        # Iterate lazily instead of collecting all folder elements of the page in a list. Folder.from_xml() clears and
+        # detaches each element when it has been parsed, so parsed elements can be garbage-collected right away.
+        return container.iterchildren()
+
     def get_payload(self, folders, additional_fields, restriction, shape, depth, page_size, offset=0):
+        # When paging, this method is called once per page with identical arguments except for 'offset'. Only build the
+        # payload once per set of arguments, and then just update the offset.
+        static_args = (folders, additional_fields, restriction, shape, depth, page_size, self.account.version)
+        if self._payload_cache is None or any(a is not b for a, b in zip(self._payload_cache[0], static_args)):
+            self._payload_cache = static_args, self._get_static_payload(*static_args)
+        findfolder, indexedpageviewitem = self._payload_cache[1]
+        if indexedpageviewitem is None:
+            if offset != 0:
+                raise ValueError('Offsets are only supported from Exchange 2010')
+        else:
+            indexedpageviewitem.set('Offset', str(offset))
+        return findfolder
+
+    def _get_static_payload(self, folders, additional_fields, restriction, shape, depth, page_size, version):
         findfolder = create_element('m:%s' % self.SERVICE_NAME, attrs=dict(Traversal=depth))
         foldershape = create_shape_element(
-            tag='m:FolderShape', shape=shape, additional_fields=additional_fields, version=self.account.version
+            tag='m:FolderShape', shape=shape, additional_fields=additional_fields, version=version
         )
         findfolder.append(foldershape)
-        if self.account.version.build >= EXCHANGE_2010:
+        indexedpageviewitem = None
+        if version.build >= EXCHANGE_2010:
             indexedpageviewitem = create_element(
                 'm:IndexedPageFolderView',
                 attrs=OrderedDict([
                     ('MaxEntriesReturned', str(page_size)),
-                    ('Offset', str(offset)),
+                    ('Offset', '0'),
                     ('BasePoint', 'Beginning'),
                 ])
             )
             findfolder.append(indexedpageviewitem)
-        else:
-            if offset != 0:
-                raise ValueError('Offsets are only supported from Exchange 2010')
         if restriction:
-            findfolder.append(restriction.to_xml(version=self.account.version))
+            findfolder.append(restriction.to_xml(version=version))
         parentfolderids = create_element('m:ParentFolderIds')
-        set_xml_value(parentfolderids, folders, version=self.account.version)
+        set_xml_value(parentfolderids, folders, version=version)
         findfolder.append(parentfolderids)
-        return findfolder
+        return findfolder, indexedpageviewitem
@@ -1,6 +1,7 @@
 """A dict to translate from IANA location name to Windows timezone name. Translations taken from
 http://unicode.org/repos/cldr/trunk/common/supplemental/windowsZones.xml
 """
+from functools import lru_cache
 import re
 
 import requests
@@ -14,11 +15,19 @@ CLDR_WINZONE_OTHER_VERSION = '7e11800'
 
 
 def generate_map(timeout=10):
-    """Create a new CLDR_TO_MS_TIMEZONE_MAP map from the CLDR data. Used when the CLDR database is updated.
+    """Create a new CLDR_TO_MS_TIMEZONE_MAP map from the CLDR data. Used when the CLDR database is updated. The CLDR
+    data is only downloaded once per process. Failed downloads are not cached.
 
     :param timeout:  (Default value = 10)
     :return:
     """
+    type_version, other_version, tz_map = _generate_map(timeout=timeout)
+    # Don't let callers modify the cached map
+    return type_version, other_version, dict(tz_map)
+
+
+@lru_cache(maxsize=None)
+def _generate_map(timeout):
     r = requests.get(CLDR_WINZONE_URL, timeout=timeout)
     if r.status_code != 200:
         raise ValueError('Unexpected response: %s' % r)
@@ -51,6 +51,35 @@ def mock_session_exception(exc_cls):
     return raise_exc
 
 
+_SHARED_ACCOUNT = None
+
+
+def _get_shared_account():
+    # Parse settings.yml and create the test account only once per test run, instead of once per test class. Sharing
+    # the account also shares the connection pool and the server version detected when the account was created.
+    global _SHARED_ACCOUNT
+    if _SHARED_ACCOUNT is None:
+        with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'settings.yml')) as f:
+            settings = safe_load(f)
+
+        if not settings.get('verify_ssl', True):
+            # Allow unverified TLS if requested in settings file
+            BaseProtocol.HTTP_ADAPTER_CLS = NoVerifyHTTPAdapter
+
+        # Create an account shared by all tests
+        tz = zoneinfo.ZoneInfo('Europe/Copenhagen')
+        retry_policy = FaultTolerance(max_wait=600)
+        config = Configuration(
+            server=settings['server'],
+            credentials=Credentials(settings['username'], settings['password']),
+            retry_policy=retry_policy,
+        )
+        account = Account(primary_smtp_address=settings['account'], access_type=DELEGATE, config=config,
+                          locale='da_DK', default_timezone=tz)
+        _SHARED_ACCOUNT = settings, retry_policy, account
+    return _SHARED_ACCOUNT
+
+
 class TimedTestCase(unittest.TestCase, metaclass=abc.ABCMeta):
     SLOW_TEST_DURATION = 5  # Log tests that are slower than this value (in seconds)
 
@@ -64,6 +93,47 @@ class TimedTestCase(unittest.TestCase, metaclass=abc.ABCMeta):
             print("{:07.3f} : {}".format(t2, self.id()))
 
 
+# Value generators for EWSTest.random_val(), for field types that only need a simple random value. Subclasses of these
+# field classes use the generator of their nearest base class. Other field types are handled by the isinstance() chain
+# in random_val().
+_RANDOM_VAL_DISPATCH = {
+    URIField: lambda self, field: get_random_url(),
+    EmailAddressField: lambda self, field: get_random_email(),
+    ChoiceField: lambda self, field: get_random_choice(_supported_choices(field, version=self.account.version)),
+    CultureField: lambda self, field: get_random_choice(
+        ['da-DK', 'de-DE', 'en-US', 'es-ES', 'fr-CA', 'nl-NL', 'ru-RU', 'sv-SE']
+    ),
+    BodyField: lambda self, field: get_random_string(400),
+    CharListField: lambda self, field: [get_random_string(16) for _ in range(random.randint(1, 4))],
+    TextListField: lambda self, field: [get_random_string(400) for _ in range(random.randint(1, 4))],
+    CharField: lambda self, field: get_random_string(field.max_length),
+    TextField: lambda self, field: get_random_string(400),
+    MimeContentField: lambda self, field: get_random_string(400).encode('utf-8'),
+    Base64Field: lambda self, field: get_random_bytes(400),
+    BooleanField: lambda self, field: get_random_bool(),
+    DecimalField: lambda self, field: get_random_decimal(field.min or 1, field.max or 99),
+    IntegerField: lambda self, field: get_random_int(field.min or 0, field.max or 256),
+    DateField: lambda self, field: get_random_date(),
+    DateTimeBackedDateField: lambda self, field: get_random_date(),
+    DateTimeField: lambda self, field: get_random_datetime(tz=self.account.default_timezone),
+    TimeZoneField: lambda self, field: zoneinfo.ZoneInfo(random.choice(_valid_ews_timezones())),
+}
+
+
+# Maps each field class seen by random_val() to its generator in _RANDOM_VAL_DISPATCH, or None
+_RANDOM_VAL_HANDLERS = {}
+
+
+def _get_random_val_handler(field_cls):
+    try:
+        return _RANDOM_VAL_HANDLERS[field_cls]
+    except KeyError:
+        pass
+    handler = next((_RANDOM_VAL_DISPATCH[c] for c in field_cls.__mro__ if c in _RANDOM_VAL_DISPATCH), None)
+    _RANDOM_VAL_HANDLERS[field_cls] = handler
+    return handler
+
+
 class EWSTest(TimedTestCase, metaclass=abc.ABCMeta):
     @classmethod
     def setUpClass(cls):
@@ -73,29 +143,12 @@ class EWSTest(TimedTestCase, metaclass=abc.ABCMeta):
         # If you want to test against your own server and account, create your own settings.yml with credentials for
         # that server. 'settings.yml.sample' is provided as a template.
         try:
-            with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'settings.yml')) as f:
-                settings = safe_load(f)
+            cls.settings, cls.retry_policy, cls.account = _get_shared_account()
         except FileNotFoundError:
             print('Skipping %s - no settings.yml file found' % cls.__name__)
             print('Copy settings.yml.sample to settings.yml and enter values for your test server')
             raise unittest.SkipTest('Skipping %s - no settings.yml file found' % cls.__name__)
-
-        cls.settings = settings
-        cls.verify_ssl = settings.get('verify_ssl', True)
-        if not cls.verify_ssl:
-            # Allow unverified TLS if requested in settings file
-            BaseProtocol.HTTP_ADAPTER_CLS = NoVerifyHTTPAdapter
-
-        # Create an account shared by all tests
-        tz = zoneinfo.ZoneInfo('Europe/Copenhagen')
-        cls.retry_policy = FaultTolerance(max_wait=600)
-        config = Configuration(
-            server=settings['server'],
-            credentials=Credentials(settings['username'], settings['password']),
-            retry_policy=cls.retry_policy,
-        )
-        cls.account = Account(primary_smtp_address=settings['account'], access_type=DELEGATE, config=config,
-                              locale='da_DK', default_timezone=tz)
+        cls.verify_ssl = cls.settings.get('verify_ssl', True)
 
     def setUp(self):
         super().setUp()
@@ -112,6 +165,9 @@ class EWSTest(TimedTestCase, metaclass=abc.ABCMeta):
             self.assertEqual(res, True)
 
     def random_val(self, field):
+        handler = _get_random_val_handler(type(field))
+        if handler:
+            return handler(self, field)
         if isinstance(field, ExtendedPropertyField):
             if field.value_cls.property_type == 'StringArray':
                 return [get_random_string(255) for _ in range(random.randint(1, 4))]
@@ -128,40 +184,6 @@ class EWSTest(TimedTestCase, metaclass=abc.ABCMeta):
                 # send a longer bytes sequence.
                 return get_random_string(16).encode()
             raise ValueError('Unsupported field %s' % field)
-        if isinstance(field, URIField):
-            return get_random_url()
-        if isinstance(field, EmailAddressField):
-            return get_random_email()
-        if isinstance(field, ChoiceField):
-            return get_random_choice(field.supported_choices(version=self.account.version))
-        if isinstance(field, CultureField):
-            return get_random_choice(['da-DK', 'de-DE', 'en-US', 'es-ES', 'fr-CA', 'nl-NL', 'ru-RU', 'sv-SE'])
-        if isinstance(field, BodyField):
-            return get_random_string(400)
-        if isinstance(field, CharListField):
-            return [get_random_string(16) for _ in range(random.randint(1, 4))]
-        if isinstance(field, TextListField):
-            return [get_random_string(400) for _ in range(random.randint(1, 4))]
-        if isinstance(field, CharField):
-            return get_random_string(field.max_length)
-        if isinstance(field, TextField):
-            return get_random_string(400)
-        if isinstance(field, MimeContentField):
-            return get_random_string(400).encode('utf-8')
-        if isinstance(field, Base64Field):
-            return get_random_bytes(400)
-        if isinstance(field, BooleanField):
-            return get_random_bool()
-        if isinstance(field, DecimalField):
-            return get_random_decimal(field.min or 1, field.max or 99)
-        if isinstance(field, IntegerField):
-            return get_random_int(field.min or 0, field.max or 256)
-        if isinstance(field, DateField):
-            return get_random_date()
-        if isinstance(field, DateTimeBackedDateField):
-            return get_random_date()
-        if isinstance(field, DateTimeField):
-            return get_random_datetime(tz=self.account.default_timezone)
         if isinstance(field, AttachmentField):
             return [FileAttachment(name='my_file.txt', content=get_random_string(400).encode('utf-8'))]
         if isinstance(field, MailboxListField):
@@ -193,15 +215,15 @@ class EWSTest(TimedTestCase, metaclass=abc.ABCMeta):
             return [self.account.primary_smtp_address]
         if isinstance(field, EmailAddressesField):
             addrs = []
-            for label in EmailAddress.get_field_by_fieldname('label').supported_choices(version=self.account.version):
+            for label in _supported_choices(EmailAddress.get_field_by_fieldname('label'), version=self.account.version):
                 addr = EmailAddress(email=get_random_email())
                 addr.label = label
                 addrs.append(addr)
             return addrs
         if isinstance(field, PhysicalAddressField):
             addrs = []
-            for label in PhysicalAddress.get_field_by_fieldname('label')\
-                    .supported_choices(version=self.account.version):
+            for label in _supported_choices(PhysicalAddress.get_field_by_fieldname('label'),
+                                            version=self.account.version):
                 addr = PhysicalAddress(street=get_random_string(32), city=get_random_string(32),
                                        state=get_random_string(32), country=get_random_string(32),
                                        zipcode=get_random_string(8))
@@ -210,7 +232,7 @@ class EWSTest(TimedTestCase, metaclass=abc.ABCMeta):
             return addrs
         if isinstance(field, PhoneNumberField):
             pns = []
-            for label in PhoneNumber.get_field_by_fieldname('label').supported_choices(version=self.account.version):
+            for label in _supported_choices(PhoneNumber.get_field_by_fieldname('label'), version=self.account.version):
                 pn = PhoneNumber(phone_number=get_random_string(16))
                 pn.label = label
                 pns.append(pn)
@@ -242,14 +264,6 @@ class EWSTest(TimedTestCase, metaclass=abc.ABCMeta):
                 yomi_first_name=get_random_string(16),
                 yomi_last_name=get_random_string(16),
             )
-        if isinstance(field, TimeZoneField):
-            while True:
-                tz = zoneinfo.ZoneInfo(random.choice(tuple(zoneinfo.available_timezones())))
-                try:
-                    EWSTimeZone.from_zoneinfo(tz)
-                except UnknownTimeZone:
-                    continue
-                return tz
         if isinstance(field, PermissionSetField):
             return PermissionSet(
                 permissions=[
@@ -261,6 +275,40 @@ class EWSTest(TimedTestCase, metaclass=abc.ABCMeta):
         raise ValueError('Unknown field %s' % field)
 
 
+_SUPPORTED_CHOICES = {}
+
+
+def _supported_choices(field, version):
+    # Field.supported_choices() only depends on the field and the server build, so cache the result. Fields are defined
+    # once per class, so we can safely key on the field object identity. Field.__hash__ is based on the field URI,
+    # which is not unique.
+    key = id(field), version.build
+    try:
+        return _SUPPORTED_CHOICES[key]
+    except KeyError:
+        choices = _SUPPORTED_CHOICES[key] = tuple(field.supported_choices(version=version))
+        return choices
+
+
+_EWS_VALID_TIMEZONES = None
+
+
+def _valid_ews_timezones():
+    # The timezones that are available locally and that EWSTimeZone can translate don't change during a test run, so
+    # only calculate this once.
+    global _EWS_VALID_TIMEZONES
+    if _EWS_VALID_TIMEZONES is None:
+        valid_timezones = []
+        for key in sorted(zoneinfo.available_timezones()):
+            try:
+                EWSTimeZone.from_zoneinfo(zoneinfo.ZoneInfo(key))
+            except UnknownTimeZone:
+                continue
+            valid_timezones.append(key)
+        _EWS_VALID_TIMEZONES = tuple(valid_timezones)
+    return _EWS_VALID_TIMEZONES
+
+
 def get_random_bool():
     return bool(random.randint(0, 1))
 
@@ -276,17 +324,33 @@ def get_random_decimal(min_val=0, max_val=100):
 
 
 def get_random_choice(choices):
-    return random.sample(tuple(choices), 1)[0]
+    return random.choice(choices if isinstance(choices, (list, tuple)) else tuple(choices))
+
+
+# Precomputed character sets for get_random_string(), keyed by (spaces, special)
+_RANDOM_STRING_CHARS = {
+    (spaces, special): string.ascii_letters + string.digits + (':.-_' if special else '') + (' ' if spaces else '')
+    for spaces in (True, False) for special in (True, False)
+}
+
+
+def _random_string_table(chars):
+    # Returns a bytes.translate() table that maps each byte value to one of 'chars', and the byte values to delete to
+    # avoid a modulo bias towards the first characters.
+    usable = 256 - 256 % len(chars)
+    return bytes(ord(chars[i % len(chars)]) for i in range(256)), bytes(range(usable, 256))
+
+
+_RANDOM_STRING_TABLES = {k: _random_string_table(v) for k, v in _RANDOM_STRING_CHARS.items()}
 
 
 def get_random_string(length, spaces=True, special=True):
-    chars = string.ascii_letters + string.digits
-    if special:
-        chars += ':.-_'
-    if spaces:
-        chars += ' '
+    table, delete = _RANDOM_STRING_TABLES[(bool(spaces), bool(special))]
+    res = b''
+    while len(res) < length:
+        res += os.urandom(2 * length).translate(table, delete)
     # We want random strings that don't end in spaces - Exchange strips these
-    res = ''.join(map(lambda i: random.choice(chars), range(length))).strip()
+    res = res[:length].decode('ascii').strip()
     if len(res) < length:
         # If strip() made the string shorter, make sure to fill it up
         res += get_random_string(length - len(res), spaces=False)
@@ -298,7 +362,7 @@ def get_random_byte():
 
 
 def get_random_bytes(length):
-    return bytes(get_random_int(max_val=255) for _ in range(length))
+    return os.urandom(length)
 
 
 def get_random_url():
@@ -357,7 +421,12 @@ def get_random_datetime_range(start_date=RANDOM_DATE_MIN, end_date=RANDOM_DATE_M
     # Create two random datetimes.  Both dates are inclusive.
     # Keep with a reasonable date range. A wider date range than the default values is unstable WRT timezones.
     # Calendar items raise ErrorCalendarDurationIsTooLong if duration is > 5 years.
-    return sorted([
-        get_random_datetime(start_date=start_date, end_date=end_date, tz=tz),
-        get_random_datetime(start_date=start_date, end_date=end_date, tz=tz),
-    ])
+    start_ordinal, end_ordinal = start_date.toordinal(), end_date.toordinal()
+    dt1, dt2 = (
+        datetime.datetime.fromordinal(random.randint(start_ordinal, end_ordinal))
+        + datetime.timedelta(minutes=random.randint(0, 60 * 24))
+        for _ in range(2)
+    )
+    if dt1 > dt2:
+        dt1, dt2 = dt2, dt1
+    return [dt1.replace(tzinfo=tz), dt2.replace(tzinfo=tz)]
@@ -1,4 +1,5 @@
 import datetime
+import os
 
 import dateutil.tz
 import pytz
@@ -11,12 +12,19 @@ except ImportError:
 
 from exchangelib.errors import UnknownTimeZone, NaiveDateTimeNotAllowed
 from exchangelib.ewsdatetime import EWSDateTime, EWSDate, EWSTimeZone, UTC
-from exchangelib.winzone import generate_map, CLDR_TO_MS_TIMEZONE_MAP, CLDR_WINZONE_URL, CLDR_WINZONE_TYPE_VERSION, \
-    CLDR_WINZONE_OTHER_VERSION
+from exchangelib.winzone import generate_map, _generate_map, CLDR_TO_MS_TIMEZONE_MAP, CLDR_WINZONE_URL, \
+    CLDR_WINZONE_TYPE_VERSION, CLDR_WINZONE_OTHER_VERSION
 from exchangelib.util import CONNECTION_ERRORS
 
 from .common import TimedTestCase
 
+# zoneinfo.available_timezones() scans the tzdata directories on every call, so only do it once
+_SANITIZED_TZ = frozenset(
+    t for t in zoneinfo.available_timezones() if not t.startswith('SystemV/') and t != 'localtime'
+)
+# The IANA timezones that have a Windows timezone mapping
+_IANA_KEYS = frozenset(EWSTimeZone.IANA_TO_MS_MAP)
+
 
 class EWSDateTimeTest(TimedTestCase):
 
@@ -25,6 +33,8 @@ class EWSDateTimeTest(TimedTestCase):
         self.assertIsInstance(EWSDateTime.now(), EWSDateTime)
         self.assertIsInstance(EWSDateTime.now(tz=tz), EWSDateTime)
         self.assertIsInstance(EWSDateTime.utcnow(), EWSDateTime)
+        self.assertIsInstance(EWSDateTime.now(tz=UTC), EWSDateTime)
+        self.assertIs(EWSDateTime.now(tz=UTC).tzinfo, UTC)
         self.assertIsInstance(EWSDateTime.fromtimestamp(123456789), EWSDateTime)
         self.assertIsInstance(EWSDateTime.fromtimestamp(123456789, tz=tz), EWSDateTime)
         self.assertIsInstance(EWSDateTime.utcfromtimestamp(123456789), EWSDateTime)
@@ -40,6 +50,35 @@ class EWSDateTimeTest(TimedTestCase):
         # Test localzone()
         tz = EWSTimeZone.localzone()
         self.assertIsInstance(tz, EWSTimeZone)
+        self.assertIs(EWSTimeZone.localzone(), tz)
+        EWSTimeZone.invalidate_localzone()
+        self.assertEqual(EWSTimeZone.localzone(), tz)
+
+        # Test localzone() on a subclass
+        class MyTimeZone(EWSTimeZone):
+            pass
+
+        sub_tz = MyTimeZone.localzone()
+        self.assertIsInstance(sub_tz, MyTimeZone)
+        self.assertIs(MyTimeZone.localzone(), sub_tz)
+        self.assertEqual(EWSTimeZone.localzone(), tz)
+        self.assertNotIsInstance(EWSTimeZone.localzone(), MyTimeZone)
+        EWSTimeZone.invalidate_localzone()
+        self.assertNotIn(MyTimeZone, EWSTimeZone._localzone_cache)
+
+        # Test that localzone() picks up a changed system timezone after invalidate_localzone()
+        orig_tz = os.environ.get('TZ')
+        try:
+            for key in ('Europe/Copenhagen', 'America/New_York'):
+                os.environ['TZ'] = key
+                EWSTimeZone.invalidate_localzone()
+                self.assertEqual(EWSTimeZone.localzone().key, key)
+        finally:
+            if orig_tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = orig_tz
+            EWSTimeZone.invalidate_localzone()
 
         # Test common helpers
         tz = EWSTimeZone('UTC')
@@ -60,8 +99,7 @@ class EWSDateTimeTest(TimedTestCase):
             self.assertIsInstance(v[0], str)
 
         # Test IANA exceptions
-        sanitized = list(t for t in zoneinfo.available_timezones() if not t.startswith('SystemV/') and t != 'localtime')
-        self.assertEqual(set(sanitized) - set(EWSTimeZone.IANA_TO_MS_MAP), set())
+        self.assertEqual(_SANITIZED_TZ - _IANA_KEYS, set())
 
         # Test timezone unknown by ZoneInfo
         with self.assertRaises(UnknownTimeZone) as e:
@@ -71,6 +109,7 @@ class EWSDateTimeTest(TimedTestCase):
         # Test timezone known by IANA but with no Winzone mapping
         with self.assertRaises(UnknownTimeZone) as e:
             del EWSTimeZone.IANA_TO_MS_MAP['Africa/Tripoli']
+            EWSTimeZone.invalidate_cache()
             EWSTimeZone('Africa/Tripoli')
         self.assertEqual(e.exception.args[0], 'No Windows timezone name found for timezone "Africa/Tripoli"')
 
@@ -80,6 +119,24 @@ class EWSDateTimeTest(TimedTestCase):
         # Test from_ms_id() with non-standard MS ID
         self.assertEqual(EWSTimeZone('Europe/Copenhagen'), EWSTimeZone.from_ms_id('Europe/Copenhagen'))
 
+    def test_ewstimezone_cache(self):
+        tz = EWSTimeZone('Europe/Copenhagen')
+        self.assertIs(tz, EWSTimeZone('Europe/Copenhagen'))
+        self.assertIs(tz, EWSTimeZone(key='Europe/Copenhagen'))
+        # Changes to IANA_TO_MS_MAP take effect after invalidating the cache
+        orig = EWSTimeZone.IANA_TO_MS_MAP['Europe/Copenhagen']
+        try:
+            EWSTimeZone.IANA_TO_MS_MAP['Europe/Copenhagen'] = ('W. Europe Standard Time', orig[1])
+            self.assertEqual(EWSTimeZone('Europe/Copenhagen').ms_id, 'Romance Standard Time')
+            EWSTimeZone.invalidate_cache()
+            self.assertEqual(EWSTimeZone('Europe/Copenhagen').ms_id, 'W. Europe Standard Time')
+        finally:
+            EWSTimeZone.IANA_TO_MS_MAP['Europe/Copenhagen'] = orig
+            EWSTimeZone.invalidate_cache()
+        self.assertEqual(tz, EWSTimeZone('Europe/Copenhagen'))
+        # UTC is a singleton, also after clearing the cache
+        self.assertIs(EWSTimeZone('UTC'), UTC)
+
     def test_from_timezone(self):
         self.assertEqual(
             EWSTimeZone('Europe/Copenhagen'),
@@ -103,6 +160,20 @@ class EWSDateTimeTest(TimedTestCase):
             EWSTimeZone.from_timezone(dateutil.tz.UTC)
         )
 
+        tz = EWSTimeZone('Europe/Copenhagen')
+        self.assertIs(EWSTimeZone.from_timezone(tz), tz)
+
+        # Test that translations are cached, and that cache entries are evicted when the source tzinfo disappears
+        tz = pytz.timezone('Europe/Copenhagen')
+        self.assertIs(EWSTimeZone.from_timezone(tz), EWSTimeZone.from_timezone(tz))
+        self.assertIn((EWSTimeZone, id(tz)), EWSTimeZone._from_tz_cache)
+        tz = zoneinfo.ZoneInfo.no_cache('Europe/Copenhagen')
+        cache_key = EWSTimeZone, id(tz)
+        EWSTimeZone.from_timezone(tz)
+        self.assertIn(cache_key, EWSTimeZone._from_tz_cache)
+        del tz
+        self.assertNotIn(cache_key, EWSTimeZone._from_tz_cache)
+
     def test_localize(self):
         # Test some corner cases around DST
         tz = EWSTimeZone('Europe/Copenhagen')
@@ -174,6 +245,24 @@ class EWSDateTimeTest(TimedTestCase):
         )
         self.assertIsInstance(EWSDateTime.from_string('2000-01-02T03:04:05+01:00'), EWSDateTime)
         self.assertIsInstance(EWSDateTime.from_string('2000-01-02T03:04:05Z'), EWSDateTime)
+        self.assertEqual(
+            EWSDateTime.from_string('2000-01-02T03:04:05.678901Z'),
+            EWSDateTime(2000, 1, 2, 3, 4, 5, 678901, tzinfo=UTC)
+        )
+        self.assertEqual(
+            EWSDateTime.from_string('2000-01-02T03:04:05.5-01:30'),
+            EWSDateTime(2000, 1, 2, 4, 34, 5, 500000, tzinfo=UTC)
+        )
+        # Formats not matched by the fast path
+        self.assertEqual(
+            EWSDateTime.from_string('2000-01-02 03:04:05+01:00'),
+            EWSDateTime(2000, 1, 2, 2, 4, 5, tzinfo=UTC)
+        )
+        with self.assertRaises(NaiveDateTimeNotAllowed) as e:
+            EWSDateTime.from_string('2000-01-02T03:04:05.678')
+        self.assertEqual(e.exception.local_dt, EWSDateTime(2000, 1, 2, 3, 4, 5, 678000))
+        with self.assertRaises(ValueError):
+            EWSDateTime.from_string('2000-13-02T03:04:05Z')
 
         # Test addition, subtraction, summertime etc
         self.assertIsInstance(dt + datetime.timedelta(days=1), EWSDateTime)
@@ -196,11 +285,14 @@ class EWSDateTimeTest(TimedTestCase):
         ))
 
         self.assertEqual(dt.ewsformat(), '2000-01-02T03:04:05.678901+01:00')
+        self.assertEqual(EWSDateTime(2000, 1, 2, 3, 4, 5, tzinfo=UTC).ewsformat(), '2000-01-02T03:04:05Z')
         utc_tz = EWSTimeZone('UTC')
         self.assertEqual(dt.astimezone(utc_tz).ewsformat(), '2000-01-02T02:04:05.678901Z')
         # Test summertime
         dt = EWSDateTime(2000, 8, 2, 3, 4, 5, 678901, tzinfo=tz)
         self.assertEqual(dt.astimezone(utc_tz).ewsformat(), '2000-08-02T01:04:05.678901Z')
+        # Test conversion to the same timezone
+        self.assertIs(dt.astimezone(tz), dt)
 
         # Test in-place add and subtract
         dt = EWSDateTime(2000, 1, 2, 3, 4, 5, tzinfo=tz)
@@ -236,15 +328,33 @@ class EWSDateTimeTest(TimedTestCase):
     @requests_mock.mock()
     def test_generate_failure(self, m):
         m.get(CLDR_WINZONE_URL, status_code=500)
+        _generate_map.cache_clear()  # Make sure we don't get a cached result from test_generate()
         with self.assertRaises(ValueError):
             generate_map()
 
+    @requests_mock.mock()
+    def test_generate_cache(self, m):
+        m.get(CLDR_WINZONE_URL, content=b'''\
+<supplementalData><windowsZones><mapTimezones typeVersion="XXX" otherVersion="YYY">
+<mapZone other="Romance Standard Time" territory="001" type="Europe/Paris"/>
+</mapTimezones></windowsZones></supplementalData>''')
+        _generate_map.cache_clear()
+        res = generate_map()
+        self.assertEqual(res, ('XXX', 'YYY', {'Europe/Paris': ('Romance Standard Time', '001')}))
+        res[2].clear()  # Modifying the returned map must not affect the cache
+        self.assertEqual(generate_map(), ('XXX', 'YYY', {'Europe/Paris': ('Romance Standard Time', '001')}))
+        self.assertEqual(m.call_count, 1)
+        _generate_map.cache_clear()
+
     def test_ewsdate(self):
         self.assertEqual(EWSDate(2000, 1, 1).ewsformat(), '2000-01-01')
         self.assertEqual(EWSDate.from_string('2000-01-01'), EWSDate(2000, 1, 1))
         self.assertEqual(EWSDate.from_string('2000-01-01Z'), EWSDate(2000, 1, 1))
         self.assertEqual(EWSDate.from_string('2000-01-01+01:00'), EWSDate(2000, 1, 1))
         self.assertEqual(EWSDate.from_string('2000-01-01-01:00'), EWSDate(2000, 1, 1))
+        self.assertIsInstance(EWSDate.from_string('2000-01-01'), EWSDate)
+        with self.assertRaises(ValueError):
+            EWSDate.from_string('2000-13-01')
         self.assertIsInstance(EWSDate(2000, 1, 2) - EWSDate(2000, 1, 1), datetime.timedelta)
         self.assertIsInstance(EWSDate(2000, 1, 2) + datetime.timedelta(days=1), EWSDate)
         self.assertIsInstance(EWSDate(2000, 1, 2) - datetime.timedelta(days=1), EWSDate)
@@ -2,14 +2,76 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 import time
 
-from exchangelib.folders import Inbox
+from exchangelib.account import Account
+from exchangelib.errors import ErrorItemNotFound
+from exchangelib.folders import Inbox, JunkEmail, SentItems
 from exchangelib.items import Message
 from exchangelib.queryset import DoesNotExist
 
-from ..common import get_random_string
+from ..common import TimedTestCase, get_random_string
 from .test_basics import CommonItemTest
 
 
+class MockAccount(Account):
+    # An account that returns canned results from the bulk methods, without contacting a server
+    def __init__(self, results):  # pylint: disable=super-init-not-called
+        self.results = results
+        self.calls = []
+
+    @property
+    def sent(self):
+        return SentItems()
+
+    @property
+    def junk(self):
+        return JunkEmail()
+
+    def bulk_send(self, ids, save_copy=True, copy_to_folder=None, chunk_size=None):
+        self.calls.append(ids)
+        return self.results
+
+    def bulk_mark_as_junk(self, ids, is_junk, move_item, chunk_size=None):
+        self.calls.append(ids)
+        return self.results
+
+
+class BulkMessageTest(TimedTestCase):
+    def get_messages(self, account):
+        return [Message(account=account, id='AAA%s' % i, changekey='BBB%s' % i) for i in range(3)]
+
+    def test_bulk_send_partial_failure(self):
+        account = MockAccount(results=[True, ErrorItemNotFound('XXX'), True])
+        messages = self.get_messages(account)
+        with self.assertRaises(ErrorItemNotFound):
+            Message.bulk_send(messages)
+        self.assertEqual(account.calls, [messages])  # One call for all messages
+        # Messages that were sent are updated, the failed message is untouched
+        for i in (0, 2):
+            self.assertIsNone(messages[i].id)
+            self.assertIsInstance(messages[i].folder, SentItems)
+        self.assertEqual(messages[1].id, 'AAA1')
+        self.assertIsNone(messages[1].folder)
+
+    def test_bulk_mark_as_junk_partial_failure(self):
+        account = MockAccount(results=[('CCC0', 'DDD0'), ErrorItemNotFound('XXX'), ('CCC2', 'DDD2')])
+        messages = self.get_messages(account)
+        with self.assertRaises(ErrorItemNotFound):
+            Message.bulk_mark_as_junk(messages, is_junk=True, move_item=True)
+        # Messages that were moved get their new IDs, the failed message is untouched
+        for i in (0, 2):
+            self.assertEqual((messages[i].id, messages[i].changekey), ('CCC%s' % i, 'DDD%s' % i))
+            self.assertIsInstance(messages[i].folder, JunkEmail)
+        self.assertEqual((messages[1].id, messages[1].changekey), ('AAA1', 'BBB1'))
+        self.assertIsNone(messages[1].folder)
+
+        # Without moving, only errors are returned
+        account = MockAccount(results=[ErrorItemNotFound('XXX')])
+        messages = self.get_messages(account)
+        with self.assertRaises(ErrorItemNotFound):
+            Message.bulk_mark_as_junk(messages, is_junk=True, move_item=False)
+        self.assertEqual([m.id for m in messages], ['AAA0', 'AAA1', 'AAA2'])
+
+
 class MessagesTest(CommonItemTest):
     # Just test one of the Message-type folders
     TEST_FOLDER = 'inbox'
@@ -86,6 +148,19 @@ class MessagesTest(CommonItemTest):
         # By default, sent items are placed in the sent folder
         self.assertEqual(self.account.sent.filter(categories__contains=item.categories).count(), 1)
 
+    def test_message_bulk_send(self):
+        items = [self.get_test_item().save(), self.get_test_item().save()]
+        Message.bulk_send(items)
+        for item in items:
+            self.assertIsNone(item.id)
+            self.assertEqual(item.folder, self.account.sent)
+        time.sleep(10)  # Requests are supposed to be transactional, but apparently not...
+        self.assertEqual(self.account.sent.filter(categories__contains=self.categories).count(), 2)
+
+        # Items must have an ID
+        with self.assertRaises(ValueError):
+            Message.bulk_send([self.get_test_item()])
+
     def test_reply(self):
         # Test that we can reply to a Message item. EWS only allows items that have been sent to receive a reply
         item = self.get_test_item()
@@ -143,6 +218,24 @@ class MessagesTest(CommonItemTest):
         self.assertEqual(item.folder, self.account.inbox)
         self.assertEqual(self.account.inbox.get(categories__contains=self.categories).id, item.id)
 
+    def test_bulk_mark_as_junk(self):
+        items = [self.get_test_item().save(), self.get_test_item().save()]
+        Message.bulk_mark_as_junk(items, is_junk=True, move_item=False)
+        for item in items:
+            self.assertEqual(item.folder, self.test_folder)
+        Message.bulk_mark_as_junk(items, is_junk=True, move_item=True)
+        for item in items:
+            self.assertEqual(item.folder, self.account.junk)
+        self.assertEqual(self.account.junk.filter(categories__contains=self.categories).count(), 2)
+        Message.bulk_mark_as_junk(items, is_junk=False, move_item=True)
+        for item in items:
+            self.assertEqual(item.folder, self.account.inbox)
+        self.assertEqual(self.account.inbox.filter(categories__contains=self.categories).count(), 2)
+
+        # Items must have an ID
+        with self.assertRaises(ValueError):
+            Message.bulk_mark_as_junk([self.get_test_item()])
+
     def test_mime_content(self):
         # Tests the 'mime_content' field
         subject = get_random_string(16)
@@ -2,13 +2,13 @@ import requests_mock
 
 from exchangelib.errors import ErrorServerBusy, ErrorNonExistentMailbox, TransportError, MalformedResponseError, \
     ErrorInvalidServerVersion, ErrorTooManyObjectsOpened, SOAPError
-from exchangelib.folders import FolderCollection
+from exchangelib.folders import FolderCollection, Folder, Root
 from exchangelib.protocol import FaultTolerance
 from exchangelib.services import GetServerTimeZones, GetRoomLists, GetRooms, ResolveNames, FindFolder
-from exchangelib.util import create_element
-from exchangelib.version import EXCHANGE_2007, EXCHANGE_2010
+from exchangelib.util import create_element, DummyResponse, MNS
+from exchangelib.version import EXCHANGE_2007, EXCHANGE_2010, Version
 
-from .common import EWSTest, mock_protocol, mock_version, mock_account, get_random_string
+from .common import EWSTest, TimedTestCase, mock_protocol, mock_version, mock_account, get_random_string
 
 
 class ServicesTest(EWSTest):
@@ -206,3 +206,76 @@ class ServicesTest(EWSTest):
             self.assertEqual(old_version, self.account.version.api_version)
         finally:
             self.account.version.api_version = old_version
+
+
+class FindFolderTest(TimedTestCase):
+    def setUp(self):
+        super().setUp()
+        # set_xml_value() needs a real Version instance
+        version = Version(build=EXCHANGE_2010)
+        protocol = mock_protocol(version=version, service_endpoint='example.com')
+        self.account = mock_account(version=version, protocol=protocol)
+        self.folder = Folder(root=Root(account=self.account), id='XXX', changekey='YYY')
+
+    def test_find_folder_payload_reuse(self):
+        # Test that the FindFolder payload is only built once when paging, and that only the offset changes
+        ws = FindFolder(account=self.account, chunk_size=10)
+        kwargs = dict(folders=[self.folder], additional_fields=[], restriction=None, shape='IdOnly', depth='Deep',
+                      page_size=10)
+        payload = ws.get_payload(offset=0, **kwargs)
+        self.assertEqual(payload.find('{%s}IndexedPageFolderView' % MNS).get('Offset'), '0')
+        self.assertIs(ws.get_payload(offset=20, **kwargs), payload)
+        self.assertEqual(payload.find('{%s}IndexedPageFolderView' % MNS).get('Offset'), '20')
+        # Changing any of the other arguments creates a new payload
+        kwargs['depth'] = 'Shallow'
+        new_payload = ws.get_payload(offset=0, **kwargs)
+        self.assertIsNot(new_payload, payload)
+        self.assertEqual(new_payload.get('Traversal'), 'Shallow')
+        self.assertEqual(new_payload.find('{%s}IndexedPageFolderView' % MNS).get('Offset'), '0')
+        # Equal but not identical arguments also create a new payload
+        kwargs['folders'] = [self.folder]
+        self.assertIsNot(ws.get_payload(offset=0, **kwargs), new_payload)
+
+    def test_find_folder_parse_page(self):
+        # Test that all folders in a page are returned. Folder.from_xml() removes each element from the page while we
+        # are iterating over the elements of the page.
+        ws = FindFolder(account=self.account)
+        xml = b'''\
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+    <s:Body>
+        <m:FindFolderResponse
+                xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages"
+                xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+            <m:ResponseMessages>
+                <m:FindFolderResponseMessage ResponseClass="Success">
+                    <m:ResponseCode>NoError</m:ResponseCode>
+                    <m:RootFolder IndexedPagingOffset="4" TotalItemsInView="4" IncludesLastItemInRange="true">
+                        <t:Folders>
+                            <t:Folder>
+                                <t:FolderId Id="ID_1" ChangeKey="CHANGEKEY_1"/>
+                            </t:Folder>
+                            <t:Folder>
+                                <t:FolderId Id="ID_2" ChangeKey="CHANGEKEY_2"/>
+                            </t:Folder>
+                            <t:Folder>
+                                <t:FolderId Id="ID_3" ChangeKey="CHANGEKEY_3"/>
+                            </t:Folder>
+                            <t:Folder>
+                                <t:FolderId Id="ID_4" ChangeKey="CHANGEKEY_4"/>
+                            </t:Folder>
+                        </t:Folders>
+                    </m:RootFolder>
+                </m:FindFolderResponseMessage>
+            </m:ResponseMessages>
+        </m:FindFolderResponse>
+    </s:Body>
+</s:Envelope>'''
+        _, body = ws._get_soap_parts(response=DummyResponse(url=None, headers=None, request_headers=None, content=xml))
+        # Return the static response instead of contacting the server
+        ws._get_response_xml = lambda payload, **kwargs: ws._get_soap_messages(body=body)
+        folders = list(ws.call(folders=[self.folder], additional_fields=[], restriction=None, shape='IdOnly',
+                               depth='Deep', max_items=None, offset=0))
+        self.assertEqual(
+            [(f.id, f.changekey) for f in folders],
+            [('ID_1', 'CHANGEKEY_1'), ('ID_2', 'CHANGEKEY_2'), ('ID_3', 'CHANGEKEY_3'), ('ID_4', 'CHANGEKEY_4')]
+        )